@@ -0,0 +1,49 @@
+# cython: language_level=3, boundscheck=False, wraparound=False, initializedcheck=False
+# Compiled element builder for generateCutoutMeshFile.py, for when numba isn't installed
+# Build in place with: python setup.py build_ext --inplace
+
+import numpy as np
+
+#Get the element ID, part ID and the node IDs at the 8 vertices of each element in the given regions
+#Same as build_elements_loops in generateCutoutMeshFile.py (see generate_elements for the layout of regions)
+def build_elements(const int[:, :, ::1] id_grid, const signed char[:, :, ::1] part_grid, const int[:, ::1] regions):
+    cdef Py_ssize_t max_elems = 0
+    cdef Py_ssize_t r, k = 0
+    cdef int x, y, z, xc, yc
+    cdef int n1, n2, n3, n4, n5, n6, n7, n8
+
+    for r in range(regions.shape[0]):
+        max_elems += max(regions[r,1]-regions[r,0], 0)*max(regions[r,3]-regions[r,2], 0)*max(regions[r,5]-regions[r,4], 0)
+    out = np.empty((max_elems, 10), dtype=np.int32)
+    cdef int[:, ::1] out_mv = out
+
+    for r in range(regions.shape[0]):
+        xc = regions[r,6]
+        yc = regions[r,7]
+        for z in range(regions[r,4], regions[r,5]):
+            for y in range(regions[r,2], regions[r,3]):
+                for x in range(regions[r,0], regions[r,1]):
+                    if x >= xc and y >= yc:
+                        continue
+                    n1 = id_grid[z,y,x]
+                    n2 = id_grid[z,y,x+1]
+                    n3 = id_grid[z,y+1,x+1]
+                    n4 = id_grid[z,y+1,x]
+                    n5 = id_grid[z+1,y,x]
+                    n6 = id_grid[z+1,y,x+1]
+                    n7 = id_grid[z+1,y+1,x+1]
+                    n8 = id_grid[z+1,y+1,x]
+                    if n1 < 0 or n2 < 0 or n3 < 0 or n4 < 0 or n5 < 0 or n6 < 0 or n7 < 0 or n8 < 0:
+                        continue
+                    out_mv[k,0] = k+1
+                    out_mv[k,1] = part_grid[z,y,x]
+                    out_mv[k,2] = n1
+                    out_mv[k,3] = n2
+                    out_mv[k,4] = n3
+                    out_mv[k,5] = n4
+                    out_mv[k,6] = n5
+                    out_mv[k,7] = n6
+                    out_mv[k,8] = n7
+                    out_mv[k,9] = n8
+                    k += 1
+    return out[:k]
@@ -5,8 +5,36 @@
 
 import numpy as np
 import os
+import sys
+from dataclasses import dataclass
+
+try:
+    from numba import njit, prange
+except ImportError:     #numba is optional; see build_elements
+    njit = None
+    prange = range
+
+#Nodes stored as one array per column
+@dataclass
+class Nodes:
+    ids: np.ndarray     #node IDs (int32)
+    x: np.ndarray       #coordinates (float64)
+    y: np.ndarray
+    z: np.ndarray
+    tc: np.ndarray      #translational constraints (int8)
+    rc: np.ndarray      #rotational constraints (int8)
+    ix: np.ndarray      #integer grid indices (int32), i.e. coordinates divided by element_size
+    iy: np.ndarray
+    iz: np.ndarray
+
 
 #HELPER FUNCTIONS
+#Convert a length to integer grid indices, rounding to nearest int
+#E.g., if L = 100 and element_size = 0.5, to_index(100, 0.5) -> 200.
+def to_index(L, element_size):
+    return int(round(L/element_size))
+
+
 #Generate the node IDs and coordinates; ordered in the same manner as in 'fine.inc'
 def generate_nodes(element_size, outer_dims, expl_dims, cutout_dims, cutout_offset):
     xf, yf, zf = outer_dims
@@ -14,13 +42,7 @@ def generate_nodes(element_size, outer_dims, expl_dims, cutout_dims, cutout_offs
     xi_cutout_offset = cutout_offset[0]
     yf_cutout = cutout_dims[1]
     tol = 1e-10
-    nodes = []
     
-    #If there is no cutout specified
-    if np.allclose(cutout_dims, 0) and np.allclose(cutout_offset, 0):
-        xi_cutout_offset = xf
-        yf_cutout = yf
-
     #Check that there are an integer # of elements in the explosive region
     nx_expl = xf_expl/element_size
     ny_expl = yf_expl/element_size
@@ -36,257 +58,294 @@ def generate_nodes(element_size, outer_dims, expl_dims, cutout_dims, cutout_offs
         )
         return None     #quit early
 
-    #Convert all lengths to indices, rounding to nearest int
-    def to_index(L):
-        return int(round(L/element_size))
-    nxf = to_index(xf)
-    nyf = to_index(yf)
-    nzf = to_index(zf)
-    nxf_e = to_index(xf_expl)
-    nyf_e = to_index(yf_expl)
-    nzf_e = to_index(zf_expl)
-    nxi_c_o = to_index(xi_cutout_offset)
-    nyf_c = to_index(yf_cutout)
-
-    def add_node(xi,yi,zi):
-        #append coordinates scaled by element_size
-        nodes.append((xi*element_size, yi*element_size, zi*element_size))
-
-    #Explosive region, including boundaries
-    for z in range(nzf_e+1):
-        for y in range(nyf_e+1):
-            for x in range(nxf_e+1):
-                add_node(x,y,z)
-
-    #Region above explosive region to cutout height
-    for z in range(nzf+1):
-        for y in range(nyf_e+1, nyf_c+1):
-            for x in range(0, nxf_e+1):
-                add_node(x,y,z)
-
-    #Region further above
-    for z in range(nzf+1):
-        for y in range(nyf_c+1, nyf+1):
-            for x in range(0, nxf_e+1):
-                add_node(x,y,z)
-
-    #Region to the right of explosive region
-    for z in range(nzf+1):
-        for y in range(0, nyf_e+1):
-            for x in range(nxf_e+1, nxi_c_o+1):
-                add_node(x,y,z)
-
-    #Region above to cutout height
-    for z in range(nzf+1):
-        for y in range(nyf_e+1, nyf_c+1):
-            for x in range(nxf_e+1, nxi_c_o+1):
-                add_node(x,y,z)
-
-    #Region further above
-    for z in range(nzf+1):
-        for y in range(nyf_c+1, nyf+1):
-            for x in range(nxf_e+1, nxi_c_o+1):
-                add_node(x,y,z)
-
-    #Region above the cutout
-    for z in range(nzf+1):
-        #where y = nyf_c
-        for x in range(nxi_c_o+1, nxf+1):
-            add_node(x, nyf_c, z)
-        #then above it
-        for y in range(nyf_c+1, nyf+1):
-            for x in range(nxi_c_o+1, nxf+1):
-                add_node(x, y, z)
-
-    nodes = np.array(nodes, dtype=float)
-    node_IDs = np.arange(1, nodes.shape[0]+1).reshape(-1, 1)    #generate column of node IDs
-    nodes = np.hstack((node_IDs, nodes))
+    #Convert all lengths to indices
+    nxf = to_index(xf, element_size)
+    nyf = to_index(yf, element_size)
+    nzf = to_index(zf, element_size)
+    nxf_e = to_index(xf_expl, element_size)
+    nyf_e = to_index(yf_expl, element_size)
+    nzf_e = to_index(zf_expl, element_size)
+    nxi_c_o = to_index(xi_cutout_offset, element_size)
+    nyf_c = to_index(yf_cutout, element_size)
+
+    #Node regions as rows of: x0, x1, y0, y1, z0, z1; each region spans [x0,x1) x [y0,y1) x [z0,z1)
+    regions = [
+        (0, nxf_e+1, 0, nyf_e+1, 0, nzf_e+1),                 #explosive region, including boundaries
+        (0, nxf_e+1, nyf_e+1, nyf_c+1, 0, nzf+1),             #region above explosive region to cutout height
+        (0, nxf_e+1, nyf_c+1, nyf+1, 0, nzf+1),               #region further above
+        (nxf_e+1, nxi_c_o+1, 0, nyf_e+1, 0, nzf+1),           #region to the right of explosive region
+        (nxf_e+1, nxi_c_o+1, nyf_e+1, nyf_c+1, 0, nzf+1),     #region above to cutout height
+        (nxf_e+1, nxi_c_o+1, nyf_c+1, nyf+1, 0, nzf+1),       #region further above
+        (nxi_c_o+1, nxf+1, nyf_c, nyf+1, 0, nzf+1),           #region above the cutout, starting at y = nyf_c
+    ]
+
+    #Preallocate all nodes, then fill in each region's block of coordinates scaled by element_size
+    shapes = [(max(z1-z0, 0), max(y1-y0, 0), max(x1-x0, 0)) for x0, x1, y0, y1, z0, z1 in regions]
+    n = sum(nz*ny*nx for nz, ny, nx in shapes)
+    nodes = Nodes(
+        ids=np.arange(1, n+1, dtype=np.int32),     #generate node IDs
+        x=np.empty(n), y=np.empty(n), z=np.empty(n),
+        tc=np.full(n, 3, dtype=np.int8),     #tc=3 (constrained in z disp) - updated by add_constraints
+        rc=np.full(n, 7, dtype=np.int8),     #rc=7 (constrained in xyz rot) - won't touch
+        ix=np.empty(n, dtype=np.int32), iy=np.empty(n, dtype=np.int32), iz=np.empty(n, dtype=np.int32),
+    )
+
+    #Indices and coordinates along each axis of the regular grid; every region's block is a slice of these
+    xi = np.arange(max(r[1] for r in regions), dtype=np.int32)
+    yi = np.arange(max(r[3] for r in regions), dtype=np.int32)
+    zi = np.arange(max(r[5] for r in regions), dtype=np.int32)
+    xs, ys, zs = xi*element_size, yi*element_size, zi*element_size
+
+    offset = 0
+    for (x0, x1, y0, y1, z0, z1), (nz, ny, nx) in zip(regions, shapes):
+        #views of the region's rows, ordered with x varying fastest, then y, then z
+        rows = slice(offset, offset+nz*ny*nx)
+        nodes.x[rows].reshape(nz, ny, nx)[:] = xs[x0:x1]
+        nodes.y[rows].reshape(nz, ny, nx)[:] = ys[y0:y1, None]
+        nodes.z[rows].reshape(nz, ny, nx)[:] = zs[z0:z1, None, None]
+        nodes.ix[rows].reshape(nz, ny, nx)[:] = xi[x0:x1]
+        nodes.iy[rows].reshape(nz, ny, nx)[:] = yi[y0:y1, None]
+        nodes.iz[rows].reshape(nz, ny, nx)[:] = zi[z0:z1, None, None]
+        offset += nz*ny*nx
+
     return nodes
 
 
-#Add translational and rotational constraints to nodes
-def add_constraints(nodes, outer_dims, cutout_dims, cutout_offset, fixed_coords):
-    xf, yf, _ = outer_dims
+#Add translational constraints to nodes, updating nodes.tc in place
+def add_constraints(nodes, element_size, outer_dims, cutout_dims, cutout_offset, fixed_coords):
+    x, y, z, tc = nodes.x, nodes.y, nodes.z, nodes.tc
+    ix, iy = nodes.ix, nodes.iy
+
+    #Compare integer grid indices exactly instead of coordinates within a tolerance
+    nxf = to_index(outer_dims[0], element_size)
+    nyf = to_index(outer_dims[1], element_size)
+    nxi_c_o = to_index(cutout_offset[0], element_size)
+    nyf_c = to_index(cutout_dims[1], element_size)
+
+    #If node is on outer edges parallel to x axis but that are not the top edges
+    on_x_edge = ((iy == 0) | ((iy == nyf_c) & (ix > nxi_c_o))) & (iy != nyf)
+    tc[on_x_edge] = 5   #constrain y and z disp
+
+    #If node is on outer edges parallel to y axis but that are not the rightmost edges
+    on_y_edge = ((ix == 0) | ((ix == nxi_c_o) & (iy < nyf_c))) & (ix != nxf)
+    tc[on_y_edge] = 6   #constrain z and x disp
+
+    #If node is one of the specified fixed nodes
+    fixed = np.asarray(fixed_coords, dtype=float).reshape(-1, 3)
+    is_fixed = (
+        np.isclose(x[:,None], fixed[:,0]) & np.isclose(y[:,None], fixed[:,1]) & np.isclose(z[:,None], fixed[:,2])
+    ).any(axis=1)
+    tc[is_fixed] = 7    #constrain xyz disp
+
+
+#Get the region r and the y, z of a row of elements, where rows are numbered in output order (see build_elements_loops)
+def element_row(regions, row_starts, row):
+    r = 0
+    while row >= row_starts[r+1]:
+        r += 1
+    ny = regions[r,3]-regions[r,2]
+    q = row-row_starts[r]
+    return r, regions[r,2]+q%ny, regions[r,4]+q//ny
+
+#Get the node IDs at the 8 vertices of the element with lower corner [z,y,x] in id_grid
+def element_vertices(id_grid, x, y, z):
+    return (
+        id_grid[z,y,x], id_grid[z,y,x+1], id_grid[z,y+1,x+1], id_grid[z,y+1,x],
+        id_grid[z+1,y,x], id_grid[z+1,y,x+1], id_grid[z+1,y+1,x+1], id_grid[z+1,y+1,x]
+    )
+
+#Get the element ID, part ID and the node IDs at the 8 vertices of each element in the given regions (see generate_elements)
+#Elements are ordered region by region, with x varying fastest, then y, then z
+#Elements where any of the nodes at the vertices don't exist (ID of -1 in id_grid) are skipped
+#Each row of elements (one region, z and y) is independent, so rows are counted first and then filled in parallel,
+#each starting at its offset in the output
+def build_elements_loops(id_grid, part_grid, regions):
+    n_regions = regions.shape[0]
+    row_starts = np.zeros(n_regions+1, np.int64)    #first row of each region
+    for r in range(n_regions):
+        row_starts[r+1] = row_starts[r] + max(regions[r,3]-regions[r,2], 0)*max(regions[r,5]-regions[r,4], 0)
+    n_rows = row_starts[n_regions]
+
+    #Count the elements in each row
+    counts = np.zeros(n_rows, np.int64)
+    for row in prange(n_rows):
+        r, y, z = element_row(regions, row_starts, row)
+        xc, yc = regions[r,6], regions[r,7]
+        count = 0
+        for x in range(regions[r,0], regions[r,1]):
+            if x >= xc and y >= yc:
+                continue
+            n1, n2, n3, n4, n5, n6, n7, n8 = element_vertices(id_grid, x, y, z)
+            if min(n1, n2, n3, n4, n5, n6, n7, n8) >= 0:
+                count += 1
+        counts[row] = count
+    offsets = np.cumsum(counts)-counts      #index of the first element of each row
+    out = np.empty((counts.sum(), 10), np.int32)
+
+    #Fill in the elements of each row
+    for row in prange(n_rows):
+        r, y, z = element_row(regions, row_starts, row)
+        xc, yc = regions[r,6], regions[r,7]
+        k = offsets[row]
+        for x in range(regions[r,0], regions[r,1]):
+            if x >= xc and y >= yc:
+                continue
+            n1, n2, n3, n4, n5, n6, n7, n8 = element_vertices(id_grid, x, y, z)
+            if min(n1, n2, n3, n4, n5, n6, n7, n8) < 0:
+                continue
+            out[k,0] = k+1
+            out[k,1] = part_grid[z,y,x]
+            out[k,2] = n1
+            out[k,3] = n2
+            out[k,4] = n3
+            out[k,5] = n4
+            out[k,6] = n5
+            out[k,7] = n6
+            out[k,8] = n7
+            out[k,9] = n8
+            k += 1
+    return out
+
+
+#Offsets of the 8 vertices of an element from its lower corner, in LS-DYNA hexahedron node order
+VERTEX_OFFSETS = ((0,0,0), (1,0,0), (1,1,0), (0,1,0), (0,0,1), (1,0,1), (1,1,1), (0,1,1))
+
+#Same as build_elements_loops, vectorized with numpy for when numba isn't installed
+def build_elements_numpy(id_grid, part_grid, regions):
+    sizes = [max(x1-x0, 0)*max(y1-y0, 0)*max(z1-z0, 0) for x0, x1, y0, y1, z0, z1, _, _ in regions]
+    out = np.empty((sum(sizes), 10), np.int32)
+
+    k = 0
+    for (x0, x1, y0, y1, z0, z1, xc, yc), n in zip(regions, sizes):
+        zz, yy, xx = np.mgrid[z0:max(z1, z0), y0:max(y1, y0), x0:max(x1, x0)]     #empty if a range runs backwards
+        xx, yy, zz = xx.ravel(), yy.ravel(), zz.ravel()
+        block = out[k:k+n]
+        block[:,1] = part_grid[zz,yy,xx]
+        for col, (dx, dy, dz) in enumerate(VERTEX_OFFSETS, start=2):
+            block[:,col] = id_grid[zz+dz, yy+dy, xx+dx]
+        block[(xx >= xc) & (yy >= yc), 2] = -1     #mark elements truncated by the cutout as missing a vertex
+        k += n
+
+    out = out[(out[:,2:] >= 0).all(axis=1)]
+    out[:,0] = np.arange(1, out.shape[0]+1)    #generate column of element IDs
+    return out
+
+
+#Compile the loops to parallel native code when numba is available, otherwise use the Cython build of them if
+#it has been compiled (see setup.py), falling back to vectorized numpy
+if njit is not None:
+    element_row = njit(cache=True)(element_row)
+    element_vertices = njit(cache=True, boundscheck=False)(element_vertices)
+    build_elements = njit(cache=True, boundscheck=False, parallel=True)(build_elements_loops)
+else:
+    try:
+        from _mesh_core import build_elements
+    except ImportError:
+        build_elements = build_elements_numpy
+
+
+#Spread the lower 21 bits of each integer so that there are two zero bits between consecutive bits
+def part1by2(n):
+    n = n.astype(np.uint64) & 0x1fffff
+    n = (n | n << 32) & 0x1f00000000ffff
+    n = (n | n << 16) & 0x1f0000ff0000ff
+    n = (n | n << 8) & 0x100f00f00f00f00f
+    n = (n | n << 4) & 0x10c30c30c30c30c3
+    n = (n | n << 2) & 0x1249249249249249
+    return n
+
+#Order of integer grid indices (i,j,k) along the Morton (Z-order) curve, which keeps spatially adjacent indices close together
+def morton_order(i, j, k):
+    morton = part1by2(i) | (part1by2(j) << 1) | (part1by2(k) << 2)
+    return np.argsort(morton, kind='stable')
+
+
+#Generate the hexahedral elements; ordered in the same manner as in 'fine.inc', or along the Morton curve if zorder
+def generate_elements(nodes, element_size, outer_dims, expl_dims, cutout_dims, cutout_offset, zorder=False):
+    xf, yf, zf = outer_dims
+    xf_expl, yf_expl, zf_expl = expl_dims
     yf_cutout = cutout_dims[1]
     xi_cutout_offset = cutout_offset[0]
-    coords = nodes[:,1:4]
-    tc = np.full((coords.shape[0],), 3)  #fill tc column with tc=3 (constrained in z disp) - will be updated
-    rc = np.full((coords.shape[0],), 7)  #fill rc column with rc=7 (constrained in xyz rot) - won't touch
-
-    #If there is no cutout specified
-    if np.allclose(cutout_dims, 0) and np.allclose(cutout_offset, 0):
-        xi_cutout_offset = xf
-        yf_cutout = yf
-
-    for i, (x,y,z) in enumerate(coords):
-        #if node is on outer edges parallel to x axis but that are not the top edges
-        if np.isclose(y,0) or np.isclose(y,yf_cutout) and x > xi_cutout_offset and not np.isclose(y,yf):
-            tc[i]=5     #constrain y and z disp
-
-        #if node is on outer edges parallel to y axis but that are not the rightmost edges
-        if np.isclose(x,0) or np.isclose(x,xi_cutout_offset) and y < yf_cutout and not np.isclose(x,xf):
-            tc[i]=6     #constrain z and x disp
-
-        #if node is one of the specified fixed nodes
-        for fx, fy, fz in fixed_coords:
-            if np.isclose([x,y,z], [fx,fy,fz]).all():
-                tc[i]=7     #constrain xyz disp
-                break
-
-    #Add tc and rc columns
-    constraints = np.column_stack((tc, rc))
-    nodes = np.hstack((nodes, constraints))
-    return nodes
-
-
-#Generate the hexahedral elements; ordered in the same manner as in 'fine.inc'
-def generate_elements(nodes, element_size, outer_dims, expl_dims, cutout_dims, cutout_offset):
-    xf, yf, zf = map(int, outer_dims)
-    xf_expl, yf_expl, zf_expl = map(int, expl_dims)
-    yf_cutout = int(cutout_dims[1])
-    xi_cutout_offset = int(cutout_offset[0])
     part_nonexpl = 1    #part ID of the non-explosive region
     part_expl = 2
-    elements = []
-
-    #If there is no cutout specified
-    if np.allclose(cutout_dims, 0) and np.allclose(cutout_offset, 0):
-        xi_cutout_offset = xf
-        yf_cutout = yf
-
-    #Create node ID map with columns: node ID, x, y, z
-    nodes = np.asarray(nodes)
-    ids = nodes[:,0].astype(int)
-    xs = nodes[:,1].astype(float)
-    ys = nodes[:,2].astype(float)
-    zs = nodes[:,3].astype(float)
-
-    #Convert physical coordinates to integer grid indices (i,j,k) based on element size.
-    scale = 1.0/float(element_size)     #multiply by this instead of dividing to prevent floating pt errors
-    tol = 1e-10
-    ix = np.rint(xs*scale+tol).astype(int)
-    iy = np.rint(ys*scale+tol).astype(int)
-    iz = np.rint(zs*scale+tol).astype(int)
-    indices = np.stack([ix, iy, iz], axis=1)
-    
-    #Dictionary to get node ID from integer indices
-    index_to_id = {}
-    for idx, nid in zip(indices, ids):
-        key = (int(idx[0]), int(idx[1]), int(idx[2]))
-        index_to_id[key] = int(nid)
-
-    def nid(i,j,k):
-        return index_to_id[(i,j,k)]   #corresponding node ID for the integer indices
-
-    #Convert lengths to grid indices, rounding to nearest int
-    #E.g., if xf = 100 and element_size = 0.5, to_index(100) -> 200.
-    def to_index(L):
-        return int(round(L/element_size))
-    nxf = to_index(xf)
-    nyf = to_index(yf)
-    nzf = to_index(zf)
-    nxf_e = to_index(xf_expl)
-    nyf_e = to_index(yf_expl)
-    nzf_e = to_index(zf_expl)
-    nxi_c_o = to_index(xi_cutout_offset)
-    nyf_c = to_index(yf_cutout)
-
-    #Define the 8 vertices of each element and return their corresponding node IDs
-    def element_node_IDs(i,j,k):
-        try:        #try finding the node ID for each vertex
-            return [
-                nid(i,j,k), nid(i+1,j,k), nid(i+1,j+1,k), nid(i,j+1,k),
-                nid(i,j,k+1), nid(i+1,j,k+1), nid(i+1,j+1,k+1), nid(i,j+1,k+1)
-            ]
-        except KeyError:
-            return None
-
-    #Explosive region, including boundaries
-    for z in range(nzf_e):
-        for y in range(nyf_e):
-            for x in range(nxf_e):
-                ns = element_node_IDs(x,y,z)    #get the node IDs at the 8 vertices
-                if ns is None:      #if any of the nodes at the vertices don't exist
-                    continue
-                elements.append([part_expl, *ns])
-
-    #Region above explosive region
-    for z in range(nzf):
-        for y in range(nyf_e, nyf):
-            for x in range(0, nxf_e):
-                ns = element_node_IDs(x,y,z)
-                if ns is None: 
-                    continue
-                elements.append([part_nonexpl, *ns])
-
-    #Region to the right of explosive region
-    if np.allclose(cutout_dims, 0) and np.allclose(cutout_offset, 0):   #If there is no cutout specified
-        # Simple rectangular block to the right
-        for z in range(nzf):
-            for y in range(0, nyf):
-                for x in range(nxf_e, nxf):
-                    ns = element_node_IDs(x,y,z)
-                    if ns: elements.append([part_nonexpl, *ns])
-    else:
-        # With cutout: truncate the right block for rows j >= nyf_c
-        for z in range(nzf):
-            for y in range(0, nyf):
-                x_start = nxf_e
-                x_end = nxf-1
-                if y >= nyf_c:
-                    x_end = max(nxf_e-1, nxi_c_o-1)  # stop before cutout columns
-                for x in range(x_start, x_end+1):
-                    ns = element_node_IDs(x,y,z)
-                    if ns: elements.append([part_nonexpl, *ns])
-
-    #Region above cutout
-    if nyf_c < nyf and nxi_c_o < nxf:
-        for z in range(nzf):
-            for y in range(nyf_c, nyf):
-                for x in range(nxi_c_o, nxf):
-                    ns = element_node_IDs(x,y,z)
-                    if ns: elements.append([part_nonexpl, *ns])
-
-    elements = np.asarray(elements, dtype=int)
-    element_IDs = np.arange(1, elements.shape[0]+1, dtype=int).reshape(-1, 1)  #generate column of element IDs
-    elements = np.hstack((element_IDs, elements))
+    ix, iy, iz = nodes.ix, nodes.iy, nodes.iz     #integer grid indices (i,j,k) of the nodes
+
+    #Convert lengths to grid indices
+    nxf = to_index(xf, element_size)
+    nyf = to_index(yf, element_size)
+    nzf = to_index(zf, element_size)
+    nxf_e = to_index(xf_expl, element_size)
+    nyf_e = to_index(yf_expl, element_size)
+    nzf_e = to_index(zf_expl, element_size)
+    nxi_c_o = to_index(xi_cutout_offset, element_size)
+    nyf_c = to_index(yf_cutout, element_size)
+
+    #Dense grid to get node ID from integer indices, indexed as [k,j,i]; -1 where there is no node (e.g., inside the cutout)
+    #Stored with x varying fastest, like the element loops, so the vertices of consecutive elements are adjacent in memory
+    #Padded by one in each dimension so that the i+1, j+1, k+1 vertices of every element can be looked up
+    id_grid = np.full((max(nzf, iz.max())+2, max(nyf, iy.max())+2, max(nxf, ix.max())+2), -1, dtype=np.int32)
+    id_grid[iz, iy, ix] = nodes.ids
+
+    #Part ID of the element at each integer grid index [k,j,i] of its lower corner
+    part_grid = np.full(id_grid.shape, part_nonexpl, dtype=np.int8)
+    part_grid[:nzf_e, :nyf_e, :nxf_e] = part_expl
+
+    #Element regions as rows of: x0, x1, y0, y1, z0, z1, xc, yc
+    #Each region spans [x0,x1) x [y0,y1) x [z0,z1), skipping elements with x >= xc and y >= yc
+    regions = np.array([
+        [0, nxf_e, 0, nyf_e, 0, nzf_e, nxf, nyf],               #explosive region, including boundaries
+        [0, nxf_e, nyf_e, nyf, 0, nzf, nxf, nyf],               #region above explosive region
+        [nxf_e, nxf, 0, nyf, 0, nzf, nxi_c_o, nyf_c],           #region to the right, truncated before the cutout columns for rows y >= nyf_c
+        [nxi_c_o, nxf, nyf_c, nyf, 0, nzf, nxf, nyf],           #region above cutout
+    ], dtype=np.int32)
+    elements = build_elements(id_grid, part_grid, regions)
+
+    if zorder:
+        #Reorder by the Morton code of each element's lower corner (its first vertex) and renumber
+        corner = elements[:,2]-1    #row of the first vertex in nodes
+        elements = elements[morton_order(ix[corner], iy[corner], iz[corner])]
+        elements[:,0] = np.arange(1, elements.shape[0]+1)
     return elements
 
 
 #Format the node and element sections into the output file, in the same manner as 'fine.inc'
-def format_sections_into_file(node_section, element_section, output_path):
-    with open(output_path, "w") as f:
-        f.write("*NODE\n")
-        for row in node_section:
-            node_id = int(row[0])
-            x, y, z = row[1:4]
-            tc = int(row[4])
-            rc = int(row[5])
-            #node_id width=8, then one space, then space-delimited x, y, z
-            f.write(f"{node_id:8d} {x:.9E} {y:.9E} {z:.9E}{tc:8d}{rc:8d}\n")
-    
-        f.write("*ELEMENT_SOLID\n")
-        for row in element_section:
-            #10 integer fields with width=8
-            f.write("".join(f"{val:8d}" for val in row) + "\n")
-        
-        f.write("*END\n")
+def format_sections_into_file(nodes, element_section, output_path):
+    #Binary mode with a 1 MiB buffer; np.savetxt encodes the formatted rows itself
+    with open(output_path, "wb", buffering=1<<20) as f:
+        f.write(b"*NODE\n")
+        #node_id width=8, then one space, then space-delimited x, y, z, then tc and rc width=8
+        node_section = np.rec.fromarrays((nodes.ids, nodes.x, nodes.y, nodes.z, nodes.tc, nodes.rc))
+        np.savetxt(f, node_section, fmt="%8d %.9E %.9E %.9E%8d%8d", encoding="latin-1")
+
+        f.write(b"*ELEMENT_SOLID\n")
+        #10 integer fields with width=8
+        np.savetxt(f, element_section, fmt="%8d"*element_section.shape[1], encoding="latin-1")
+
+        f.write(b"*END\n")
 
 
 #MAIN
-def main(output_filename, element_size, outer_dims, cutout_dims, cutout_offset, expl_dims, fixed_coords):
+def main(output_filename, element_size, outer_dims, cutout_dims, cutout_offset, expl_dims, fixed_coords, zorder=False):
+    #If there is no cutout specified, resolve it once to an empty cutout at the top right corner (offset xf, height yf)
+    #so none of the helper functions need a separate code path for it
+    if np.allclose(cutout_dims, 0) and np.allclose(cutout_offset, 0):
+        cutout_dims = (0, outer_dims[1], 0)
+        cutout_offset = (outer_dims[0], 0, 0)
+
     nodes = generate_nodes(element_size, outer_dims, expl_dims, cutout_dims, cutout_offset)
-    node_section = add_constraints(nodes, outer_dims, cutout_dims, cutout_offset, fixed_coords)
-    element_section = generate_elements(node_section, element_size, outer_dims, expl_dims, cutout_dims, cutout_offset)
+    add_constraints(nodes, element_size, outer_dims, cutout_dims, cutout_offset, fixed_coords)
+    element_section = generate_elements(nodes, element_size, outer_dims, expl_dims, cutout_dims, cutout_offset, zorder)
 
     script_dir = os.path.dirname(os.path.abspath(__file__))     #directory of this script
     output_path = os.path.join(script_dir, output_filename)
-    format_sections_into_file(node_section, element_section, output_path)
+    format_sections_into_file(nodes, element_section, output_path)
     print(f"Mesh written to {output_filename}.")
 
 
 #SCRIPT
+#Pass --zorder to order the elements along the Morton curve instead of the default order in 'fine.inc'
 if __name__ == '__main__':
+    zorder = '--zorder' in sys.argv[1:]
     output_filename = input("Enter output file name (e.g., output.inc): ").strip()
     element_size = float(input("Enter element size (e.g., 1): "))
     
@@ -305,4 +364,4 @@ if __name__ == '__main__':
             coord = tuple(map(float, group.strip().split()))
             fixed_coords.append(coord)
 
-    main(output_filename, element_size, outer_dims, cutout_dims, cutout_offset, expl_dims, fixed_coords)
+    main(output_filename, element_size, outer_dims, cutout_dims, cutout_offset, expl_dims, fixed_coords, zorder)
@@ -1,7 +1,7 @@
 # Script to parse LS-DYNA mesh files and save nodes and elements to separate CSV files
 # Haena Lee, June 2025
 
-import re
+import numpy as np
 import pandas as pd
 
 #HELPER FUNCTIONS
@@ -20,42 +20,45 @@ def extract(content, keyword):
             break
     return section
 
+#Split the lines of a fixed-width section into columns of byte strings with the given field widths
+def split_fixed_width(section, widths):
+    lines = [line for line in section if not line.startswith('$')]     #skip comment lines
+    width = sum(widths)
+    for line in lines:
+        if len(line.rstrip()) != width:     #e.g., a short card or one in free format
+            raise ValueError(f"Expected a fixed-width card of {width} characters, got: {line!r}")
+    chars = np.array(lines, dtype=f'S{width}').view(np.uint8).reshape(-1, width)  #one row of characters per line
+    columns = []
+    start = 0
+    for w in widths:
+        columns.append(np.ascontiguousarray(chars[:, start:start+w]).view(f'S{w}').ravel())
+        start += w
+    return columns
+
 #Parse *NODE section into dataframe with columns: node ID, x, y, z, tc, rc
 def parse_nodes(section):
-    #Regex for each column entry
-    pattern = re.compile(
-        r'^\s*(\d+)\s+'          #node ID
-        r'([-+0-9.Ee]+)\s+'      #x coord
-        r'([-+0-9.Ee]+)\s+'      #y coord
-        r'([-+0-9.Ee]+)\s+'      #z coord
-        r'(\d+)\s+'              #tc
-        r'(\d+)'                 #rc
-    )
+    #Node cards are fixed width: node ID (8), x, y, z (16 each), tc (8), rc (8)
+    ids, x, y, z, tc, rc = split_fixed_width(section, [8, 16, 16, 16, 8, 8])
 
-    #Save the lines that match the regex pattern as lists of tuples and convert to dataframe
-    matches = [pattern.match(line) for line in section if pattern.match(line)]
-    data = [m.groups() for m in matches]
-    df = pd.DataFrame(data, columns=['Node ID', 'X', 'Y', 'Z', 'TC', 'RC'])
-
-    #Convert columns to correct types
-    df = df.astype({
-        'Node ID': int,
-        'X': float,
-        'Y': float,
-        'Z': float,
-        'TC': int,
-        'RC': int
+    #Convert columns (from byte strings) to correct types
+    df = pd.DataFrame({
+        'Node ID': ids.astype(int),
+        'X': x.astype(float),
+        'Y': y.astype(float),
+        'Z': z.astype(float),
+        'TC': tc.astype(int),
+        'RC': rc.astype(int)
     })
     return df
 
 #Parse *ELEMENT_SOLID section into dataframe with columns: element ID, part ID, 8 columns of node IDs
 def parse_elements(section):
-    #If there are 10 integers in the line, save the lists and convert to dataframe
-    matches = [re.findall(r'\d+', line) for line in section if len(re.findall(r'\d+',line))==10]
-    df = pd.DataFrame(matches, columns=['Element ID', 'Part ID', 'N1', 'N2', 'N3', 'N4', 'N5', 'N6', 'N7', 'N8'])
-    
-    #Convert all columns (from strings) to integers
-    df = df.astype(int)    
+    #Element cards are 10 fixed-width integer fields of width 8
+    columns = ['Element ID', 'Part ID', 'N1', 'N2', 'N3', 'N4', 'N5', 'N6', 'N7', 'N8']
+    fields = split_fixed_width(section, [8]*len(columns))
+
+    #Convert all columns (from byte strings) to integers
+    df = pd.DataFrame({name: field.astype(int) for name, field in zip(columns, fields)})
     return df
 
 
@@ -0,0 +1,18 @@
+# Builds the optional compiled element builder (_mesh_core) used by generateCutoutMeshFile.py when numba isn't installed
+# Usage, from this folder: python setup.py build_ext --inplace
+
+from setuptools import setup, Extension
+from Cython.Build import cythonize
+
+extensions = [
+    Extension(
+        "_mesh_core",
+        ["_mesh_core.pyx"],
+        extra_compile_args=["-O3", "-march=native", "-ffast-math"],
+    )
+]
+
+setup(
+    name="undex-sim-mesh-core",
+    ext_modules=cythonize(extensions),
+)